@@ -1,61 +1,296 @@
+import argparse
+import errno
+import functools
 import json
+import mmap
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
+import ijson
+import orjson
+
 SOURCE_FILE = "/home/joy/Downloads/stringMatched.json"
 DEST_DIR = "/home/joy/projects/actiblog/data/threads"
+# Enough writers to keep the disk queue busy; the GIL is released during writes
+WRITE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Number of files handed to a worker per submission
+WRITE_BATCH = 64
+# Batches allowed to wait for a writer before serialization blocks
+MAX_PENDING_BATCHES = WRITE_WORKERS * 2
+# Output names for --aggregate mode
+AGGREGATE_FILE = "threads.ndjson"
+AGGREGATE_INDEX_FILE = "threads.index.json"
+# Payloads at least this large bypass the page cache where O_DIRECT is supported
+DIRECT_IO_THRESHOLD = 1 << 20
+DIRECT_IO_ALIGN = 4096
 
-def main():
-    if not os.path.exists(SOURCE_FILE):
-        print(f"Source file not found: {SOURCE_FILE}")
-        return
+def _write_all(fd, payload):
+    view = memoryview(payload)
+    while view:
+        view = view[os.write(fd, view):]
 
+def _write_direct(dest_path, payload, dir_fd):
+    """
+    Write payload with O_DIRECT from a page-aligned buffer.
+    
+    Returns False when the filesystem rejects direct I/O so the caller can
+    fall back to a buffered write.
+    """
+    size = len(payload)
+    padded = -(-size // DIRECT_IO_ALIGN) * DIRECT_IO_ALIGN
     try:
-        with open(SOURCE_FILE, 'r') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"Error decoding JSON: {e}")
-        return
+        fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT, 0o644, dir_fd=dir_fd)
+    except OSError as e:
+        if e.errno == errno.EINVAL:
+            return False
+        raise
+    try:
+        # Anonymous mappings are page-aligned, as O_DIRECT requires
+        with mmap.mmap(-1, padded) as buf:
+            buf[:size] = payload
+            # Every view of the mapping must be released before it closes, even when a write fails
+            view = memoryview(buf)
+            try:
+                written = 0
+                while written < padded:
+                    with view[written:] as chunk:
+                        written += os.write(fd, chunk)
+            except OSError as e:
+                if e.errno == errno.EINVAL:
+                    return False
+                raise
+            finally:
+                view.release()
+        # Drop the zero padding needed to keep the write aligned
+        os.ftruncate(fd, size)
+    finally:
+        os.close(fd)
+    return True
 
-    Path(DEST_DIR).mkdir(parents=True, exist_ok=True)
+def _write_batch(dir_fd, batch):
+    """
+    Write a batch of (dest_path, payload) pairs, returning the paths that failed.
+    
+    When dir_fd is given, dest_path is resolved relative to that open directory
+    instead of walking the full destination path for every file.
+    """
+    failed = []
+    for dest_path, payload in batch:
+        try:
+            if (hasattr(os, 'O_DIRECT') and len(payload) >= DIRECT_IO_THRESHOLD
+                    and _write_direct(dest_path, payload, dir_fd)):
+                continue
+            fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd)
+            try:
+                _write_all(fd, payload)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            failed.append((dest_path, e))
+    return failed
 
-    count = 0
+def _read_source(path):
+    """Read the whole file into one preallocated buffer with plain reads."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        buf = bytearray(size)
+        view = memoryview(buf)
+        read = 0
+        while read < size:
+            n = os.readv(fd, [view[read:]])
+            if n == 0:
+                break
+            read += n
+        view.release()
+        del buf[read:]
+        return buf
+    finally:
+        os.close(fd)
+
+def convert_thread(thread: dict) -> dict:
+    """
+    Convert one exported thread into the shape read by the Hugo thread templates.
+    
+    Kept free of I/O and fully annotated so it can be compiled with mypyc.
+    """
+    # Extract messages
+    messages: list[dict] = [
+        {
+            "author": msg.get('messageAuthorUsername', 'Unknown'),
+            "content": msg.get('originalMessageContent', ''),
+            "timestamp": msg.get('messageTimestamp', '')
+        }
+        for msg in thread.get('matchedMessages', ())
+    ]
+    
+    # Create clean thread object
+    return {
+        "id": thread.get('ocrFilename', ''),
+        "channel": thread.get('channelName', 'unknown'),
+        "messages": messages
+    }
+
+def _iter_threads(data):
+    """Yield (safe_filename, clean_thread) for every thread in the source export."""
+    basename = os.path.basename
     for thread in data:
-        # Extract metadata
         ocr_filename = thread.get('ocrFilename', '')
-        channel_name = thread.get('channelName', 'unknown')
         
         # Clean up filename for saving
         # If ocrFilename ends in .json, we use it directly, otherwise append .json
         if not ocr_filename:
             continue
             
-        safe_filename = os.path.basename(ocr_filename)
+        safe_filename = basename(ocr_filename)
         if not safe_filename.endswith('.json'):
             safe_filename += '.json'
             
-        # Extract messages
-        messages = []
-        for msg in thread.get('matchedMessages', []):
-            messages.append({
-                "author": msg.get('messageAuthorUsername', 'Unknown'),
-                "content": msg.get('originalMessageContent', ''),
-                "timestamp": msg.get('messageTimestamp', '')
-            })
-            
-        # Create clean thread object
-        clean_thread = {
-            "id": ocr_filename,
-            "channel": channel_name,
-            "messages": messages
-        }
-        
-        # Write to file
-        dest_path = os.path.join(DEST_DIR, safe_filename)
-        with open(dest_path, 'w') as f:
-            json.dump(clean_thread, f, indent=2)
-            
-        count += 1
+        yield safe_filename, convert_thread(thread)
+
+def _write_files(threads, pretty=False):
+    """
+    Write one JSON file per thread into DEST_DIR, returning the number written.
+    
+    Output is compact unless pretty is set, since the files are read by Hugo.
+    Threads are consumed lazily and at most MAX_PENDING_BATCHES batches are
+    queued for the writers, so a streamed source never piles up in memory.
+    """
+    count = 0
+    # Open DEST_DIR once and create files relative to it where the platform allows
+    dir_fd = None
+    if os.open in os.supports_dir_fd:
+        dir_fd = os.open(DEST_DIR, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0) | getattr(os, 'O_CLOEXEC', 0))
+
+    def collect(future, size):
+        failed = future.result()
+        for dest_path, e in failed:
+            print(f"Error writing {os.path.join(DEST_DIR, dest_path)}: {e}")
+        return size - len(failed)
+
+    try:
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as pool:
+            pending = deque()
+            batch = []
+            # Threads can share a file name, so remember which batch last wrote each one
+            batch_of = {}
+            # Earlier batches still writing a name in the current batch; they finish first so the last thread wins
+            waits = set()
+
+            def submit(batch):
+                if waits:
+                    wait(waits)
+                    waits.clear()
+                future = pool.submit(_write_batch, dir_fd, batch)
+                for dest_path, _ in batch:
+                    batch_of[dest_path] = future
+                pending.append((future, len(batch)))
+
+            # Bind the per-thread lookups once outside the loop
+            dest_prefix = "" if dir_fd is not None else os.path.join(DEST_DIR, "")
+            dumps = orjson.dumps
+            option = orjson.OPT_INDENT_2 if pretty else 0
+            for safe_filename, clean_thread in threads:
+                # Serialize here so the workers only do the file I/O
+                dest_path = dest_prefix + safe_filename
+                payload = dumps(clean_thread, option=option)
+                prior = batch_of.get(dest_path)
+                if prior is not None and not prior.done():
+                    waits.add(prior)
+                batch.append((dest_path, payload))
+                if len(batch) >= WRITE_BATCH:
+                    submit(batch)
+                    batch = []
+                    # Wait on the oldest batch once the writers fall behind
+                    if len(pending) > MAX_PENDING_BATCHES:
+                        count += collect(*pending.popleft())
+                    
+            if batch:
+                submit(batch)
+                
+            while pending:
+                count += collect(*pending.popleft())
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+    return count
+
+def _write_aggregate(threads):
+    """
+    Write every thread as one line of DEST_DIR/threads.ndjson, returning the number written.
+    
+    A sidecar DEST_DIR/threads.index.json maps each thread filename to the
+    [offset, length] of its line so readers can seek or mmap straight to it.
+    """
+    index = {}
+    offset = 0
+    count = 0
+    dumps = orjson.dumps
+    with open(os.path.join(DEST_DIR, AGGREGATE_FILE), 'wb', buffering=1 << 20) as f:
+        for safe_filename, clean_thread in threads:
+            # Two writes into the large buffer avoid copying the payload to append b'\n'
+            payload = dumps(clean_thread)
+            f.write(payload)
+            f.write(b'\n')
+            index[safe_filename] = [offset, len(payload) + 1]
+            offset += len(payload) + 1
+            count += 1
+    with open(os.path.join(DEST_DIR, AGGREGATE_INDEX_FILE), 'wb') as f:
+        f.write(orjson.dumps(index))
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert an exported thread dump into Hugo data files.")
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        help=f"write all threads to a single {AGGREGATE_FILE} instead of one file per thread "
+             "(Hugo does not read this format)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="parse the source incrementally to bound memory on very large exports",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="indent per-thread JSON files for human reading",
+    )
+    args = parser.parse_args()
+
+    if args.aggregate:
+        write = _write_aggregate
+    else:
+        write = functools.partial(_write_files, pretty=args.pretty)
+
+    if args.stream:
+        try:
+            f = open(SOURCE_FILE, 'rb')
+        except FileNotFoundError:
+            print(f"Source file not found: {SOURCE_FILE}")
+            return
+        Path(DEST_DIR).mkdir(parents=True, exist_ok=True)
+        # Threads are yielded one at a time, so each is released after it is written
+        try:
+            with f:
+                count = write(_iter_threads(ijson.items(f, 'item', use_float=True)))
+        except ijson.JSONError as e:
+            print(f"Error decoding JSON: {e}")
+            return
+    else:
+        try:
+            data = orjson.loads(_read_source(SOURCE_FILE))
+        except FileNotFoundError:
+            print(f"Source file not found: {SOURCE_FILE}")
+            return
+        except (json.JSONDecodeError, orjson.JSONDecodeError) as e:
+            print(f"Error decoding JSON: {e}")
+            return
+        Path(DEST_DIR).mkdir(parents=True, exist_ok=True)
+        count = write(_iter_threads(data))
         
     print(f"Successfully converted {count} threads to {DEST_DIR}")
 
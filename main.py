@@ -1,13 +1,21 @@
 import asyncio
+import logging
 import os
+import shutil
 import urllib.parse
 import json
 import time
 import tempfile
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
+import aiofiles
 import aiohttp
+import ijson
+import msgpack
+import orjson
 from aiohttp import ClientSession
 from textual.app import App, ComposeResult
 from textual.containers import ScrollableContainer, Horizontal, Vertical
@@ -16,10 +24,138 @@ from textual.reactive import reactive
 from textual.binding import Binding
 from textual.message import Message
 
+try:
+    import aiodns  # noqa: F401 - enables aiohttp's AsyncResolver
+except ImportError:
+    aiodns = None
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
+
+# Debug output is dropped unless CRAWLER_LOG_FILE names a file to write it to
+logger = logging.getLogger("actiblog")
+logger.addHandler(logging.NullHandler())
+
+# Link URLs with these endings are downloaded as images
+IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+# Downloaded media keeps its URL's extension when it is one of these, and is saved as .jpg otherwise
+MEDIA_FILE_EXTENSIONS = frozenset({"jpg", "jpeg", "png", "gif", "webp"})
+
+# API responses worth retrying, and how many times a page request is tried
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Media answering with these is gone for good, so its URL is never tried again
+PERMANENT_FAILURE_STATUSES = frozenset({404, 410})
+FETCH_ATTEMPTS = 5
+
+# Once fewer than this many API requests are left in the window, wait for the window to reset
+RATE_LIMIT_RESERVE = 5
+
+# Number of image downloads run at once across all crawls
+IMAGE_WORKERS = 16
+
+# During a crawl, pages are appended to a journal and every Nth page rewrites the full snapshot
+SNAPSHOT_EVERY_PAGES = 50
+
+# Profiles are fetched again only once their cached copy is older than this many seconds
+PROFILE_CACHE_FILE = Path("intermediates") / "profile_cache.json"
+PROFILE_CACHE_TTL = 600
+
+# Where each downloaded URL was saved, kept across sessions so shared media is linked rather than fetched again
+DOWNLOADED_URLS_FILE = Path("intermediates") / "downloaded_urls.json"
+DEAD_URLS_FILE = Path("intermediates") / "dead_urls.json"
+
+# Each user's tweets, crawl state and images are saved in a directory of their own here
+TWITTER_DIR = Path("intermediates") / "twitter"
+
+# A crawl in one of these states has finished, successfully or not
+FINISHED_STATUSES = frozenset({"Completed", "Failed"})
+
+# The download tracking maps are saved in their own msgpack file, under these shorter names
+TRACKING_KEYS = {"tweet_id_to_url_attempts": "attempts", "tweet_id_to_url_success": "success"}
+
+
+class PermanentDownloadError(Exception):
+    """Raised when a media URL no longer exists, so retrying it can't help."""
+
+
+class ApiRateLimit:
+    """
+    Holds back API requests while the quota is nearly used up or the API asked us to slow down.
+    
+    One instance is shared by every crawl, since they all draw on the same API key's quota.
+    """
+
+    def __init__(self, reserve: int = RATE_LIMIT_RESERVE):
+        self.reserve = reserve
+        self.resume_at = 0.0
+
+    async def wait(self) -> None:
+        delay = self.resume_at - time.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        self.resume_at = max(self.resume_at, time.time() + seconds)
+
+    def update(self, headers) -> None:
+        """Pause until the window resets if the x-rate-limit headers show the quota is nearly gone."""
+        remaining = headers.get("x-rate-limit-remaining")
+        reset = headers.get("x-rate-limit-reset")
+        if remaining and reset and remaining.isdigit() and reset.isdigit() and int(remaining) < self.reserve:
+            self.resume_at = max(self.resume_at, float(reset))
+
+
+class StatusField:
+    """A status attribute shown in the status text, which is rebuilt only after one changes"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return obj.__dict__.get(self.name, 0)
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+        obj._text = None
+
+
+class AggregatedCounter(StatusField):
+    """A status counter that also applies each change to the linked aggregate status"""
+
+    def __set__(self, obj, value):
+        aggregate = obj.aggregate
+        if aggregate is not None:
+            setattr(aggregate, self.name, getattr(aggregate, self.name) + value - obj.__dict__.get(self.name, 0))
+        super().__set__(obj, value)
+
 
 class TwitterCrawlStatus:
-    def __init__(self, username: str):
+    tweets_found = AggregatedCounter()
+    images_found = AggregatedCounter()
+    images_downloaded = AggregatedCounter()
+    pages_fetched = AggregatedCounter()
+    estimated_total_tweets = AggregatedCounter()
+    error = StatusField()
+    is_complete_fetch = StatusField()
+
+    def __init__(self, username: str, aggregate: Optional["TwitterCrawlStatus"] = None):
         self.username = username
+        # Cached status text below the status line, cleared whenever a StatusField changes
+        self._text = None
+        # Running totals over the member statuses, kept current as they change
+        self.aggregate = aggregate
+        self.member_count = 0
+        self.running_count = 0
+        self.complete_count = 0
+        if aggregate is not None:
+            aggregate.member_count += 1
+        self._status = None
         self.status = "Waiting"
         self.tweets_found = 0
         self.images_found = 0
@@ -32,16 +168,32 @@ class TwitterCrawlStatus:
         self.pages_fetched = 0
         self.estimated_total_tweets = 0  # Total tweets based on user profile
         # Track download attempts and success status for each URL
-        self.tweet_id_to_url_attempts = {}  # Maps tweet_id -> {url -> attempt_count}
-        self.tweet_id_to_url_success = {}   # Maps tweet_id -> {url -> success_bool}
+        self.tweet_id_to_url_attempts = {}  # Maps (tweet_id, url) -> attempt_count
+        self.tweet_id_to_url_success = {}   # Maps (tweet_id, url) -> success_bool
         
+    @property
+    def status(self) -> str:
+        return self._status
+
+    @status.setter
+    def status(self, value: str) -> None:
+        aggregate = self.aggregate
+        if aggregate is not None:
+            aggregate.running_count += (value == "Running") - (self._status == "Running")
+            aggregate.complete_count += (value in FINISHED_STATUSES) - (self._status in FINISHED_STATUSES)
+        self._status = value
+
     @property
     def is_running(self) -> bool:
         return self.status == "Running"
 
+    @property
+    def is_queued(self) -> bool:
+        return self.status == "Queued"
+
     @property
     def is_complete(self) -> bool:
-        return self.status in ["Completed", "Failed"]
+        return self.status in FINISHED_STATUSES
 
     @property
     def duration(self) -> Optional[float]:
@@ -57,6 +209,9 @@ class TwitterCrawlStatus:
             return 0
         return min(100, int((self.tweets_found / self.estimated_total_tweets) * 100))
 
+    def queue(self):
+        self.status = "Queued"
+
     def start(self):
         self.status = "Running"
         self.started_at = time.time()
@@ -73,13 +228,16 @@ class TwitterCrawlStatus:
     def __str__(self) -> str:
         duration = f" ({self.duration:.1f}s)" if self.duration is not None else ""
         status_line = f"Status: {self.status}{duration}"
-        progress = f"{self.progress_percentage}%" if self.estimated_total_tweets > 0 else ""
-        pages = f"Pages: {self.pages_fetched}" if self.pages_fetched > 0 else ""
-        counts = f"Tweets: {self.tweets_found}/{self.estimated_total_tweets} | Images: {self.images_found}/{self.images_downloaded}"
-        stats = f"{counts} | Progress: {progress}" if progress else counts
-        complete = " (Complete)" if self.is_complete_fetch else ""
-        error = f"\nError: {self.error}" if self.error else ""
-        return f"{status_line}{complete}\n{stats} | {pages}{error}"
+        # The duration keeps ticking while running, so only the rest is cached
+        if self._text is None:
+            progress = f"{self.progress_percentage}%" if self.estimated_total_tweets > 0 else ""
+            pages = f"Pages: {self.pages_fetched}" if self.pages_fetched > 0 else ""
+            counts = f"Tweets: {self.tweets_found}/{self.estimated_total_tweets} | Images: {self.images_found}/{self.images_downloaded}"
+            stats = f"{counts} | Progress: {progress}" if progress else counts
+            complete = " (Complete)" if self.is_complete_fetch else ""
+            error = f"\nError: {self.error}" if self.error else ""
+            self._text = f"{complete}\n{stats} | {pages}{error}"
+        return f"{status_line}{self._text}"
 
 
 class TwitterUserItem(ListItem):
@@ -111,62 +269,8 @@ class CrawlStatusWidget(Static):
 
 class TwitterCrawlerApp(App):
     TITLE = "Twitter Image Crawler"
-    CSS = """
-    #sidebar {
-        width: 25%;
-        min-width: 15;
-        background: $surface-lighten-1;
-    }
-    
-    #details {
-        width: 75%;
-    }
-    
-    #status-log {
-        height: 70%;
-        border: solid $primary;
-    }
-    
-    .user-item {
-        padding: 1 2;
-        height: 3;
-    }
-    
-    .user-item:hover {
-        background: $primary-lighten-2;
-    }
-    
-    .user-item.-selected {
-        background: $primary-lighten-1;
-    }
-    
-    .status-widget {
-        padding: 1;
-        margin: 1;
-        height: auto;
-        border: solid $primary-background;
-        background: $surface;
-    }
-    
-    CrawlStatusWidget {
-        height: auto;
-    }
-    
-    .log-filter {
-        margin-bottom: 1;
-    }
-    
-    #add-user-container {
-        margin-top: 1;
-        border-top: solid $primary;
-        padding-top: 1;
-    }
-    
-    #add-user-input {
-        margin-bottom: 1;
-        width: 100%;
-    }
-    """
+    # Styles live in app.tcss next to this file
+    CSS_PATH = "app.tcss"
 
     BINDINGS = [
         Binding("q", "quit", "Quit"),
@@ -184,8 +288,36 @@ class TwitterCrawlerApp(App):
         self.session = None
         self.image_session = None
         self.selected_username = None
-        self.running_tasks = []
+        # Live tasks only; each one removes itself when it finishes
+        self.running_tasks: set = set()
+        self.crawl_tasks: set = set()
+        # Cap how many users are crawled at once; further crawls wait for a free slot
+        self.crawl_sem = asyncio.Semaphore(8)
+        # Profile lookups are spread out the same way so a long user list doesn't burst the API
+        self.profile_sem = asyncio.Semaphore(5)
+        self.profile_fetch = None
+        self.api_rate_limit = ApiRateLimit()
+        # Image downloads from every crawl share one queue drained by a fixed pool of workers
+        self.image_queue: asyncio.Queue = asyncio.Queue()
+        self.image_workers = []
+        # Futures of each user's queued downloads, awaited when that user's crawl finishes
+        self.pending_downloads: Dict[str, List[asyncio.Future]] = {}
+        # URLs being downloaded right now, and where each downloaded URL was saved
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.downloaded_urls: Dict[str, Path] = {}
+        # URLs whose media has been deleted, skipped by every crawl and retry
+        self.dead_urls: set = set()
+        # Each user's saved data once loaded or written, so later crawls and retries skip the disk
+        self.tweet_cache: Dict[str, Dict] = {}
+        # username -> [fetched_at, profile data], saved between sessions
+        self.profile_cache: Dict[str, list] = {}
+        # Names of the files already in each user's output directory
+        self.media_files: Dict[str, set] = {}
         self.current_log_filter = None
+        # Log lines waiting for the next refresh; deque appends are safe from the save threads
+        self.log_buffer = deque()
+        # Per-tweet and per-image debug lines are only logged when CRAWLER_VERBOSE=1
+        self.verbose = os.getenv("CRAWLER_VERBOSE") == "1"
         
     def compose(self) -> ComposeResult:
         yield Header()
@@ -219,13 +351,23 @@ class TwitterCrawlerApp(App):
 
     async def on_mount(self) -> None:
         self.load_usernames()
+        self.load_profile_cache()
+        self.load_downloaded_urls()
+        
+        # Create every user's output directory up front so crawls don't have to
+        TWITTER_DIR.mkdir(parents=True, exist_ok=True)
+        for username in self.usernames:
+            (TWITTER_DIR / username).mkdir(exist_ok=True)
         # Initialize API session for Twitter API
         self.session = initialize_session()
         
         # Initialize a separate session for image downloads with limited connections
-        # TCPConnector limits max number of concurrent connections
-        connector = aiohttp.TCPConnector(limit=3)  # Max 3 concurrent connections
-        self.image_session = aiohttp.ClientSession(connector=connector)
+        # One connection per image worker, with a per-host cap so no single CDN host takes them all
+        self.image_session = aiohttp.ClientSession(
+            connector=create_connector(limit=IMAGE_WORKERS, limit_per_host=8),
+            timeout=aiohttp.ClientTimeout(total=60, connect=10, sock_read=30),
+        )
+        self.image_workers = [asyncio.create_task(self.image_worker()) for _ in range(IMAGE_WORKERS)]
         
         # Initialize a virtual "All" user for aggregate stats
         self.crawl_statuses["All"] = TwitterCrawlStatus("All")
@@ -238,15 +380,14 @@ class TwitterCrawlerApp(App):
         # Add actual users
         for username in self.usernames:
             user_list.append(TwitterUserItem(username))
-            self.crawl_statuses[username] = TwitterCrawlStatus(username)
-            
-            # Start fetching user profile info in the background to get tweet counts
-            asyncio.create_task(self.fetch_user_profile_info(username))
+            self.crawl_statuses[username] = TwitterCrawlStatus(username, self.crawl_statuses["All"])
         
         # Set "All" user as initially selected
         user_list.index = 0
         self.selected_username = "All"
-        self.update_status_widget("All")
+        
+        # Render status and buffered log lines at a fixed rate rather than on every change
+        self.set_interval(0.25, self.refresh_display)
         
         # Configure log filter
         self.current_log_filter = None  # No filter by default
@@ -255,73 +396,106 @@ class TwitterCrawlerApp(App):
         self.log_gui("Starting automatic crawling of all accounts...")
         self.action_run_all()
         
+        # Fetch profile info in the background to get tweet counts for users still queued.
+        # Started after the crawls so users that got a crawl slot are already running.
+        self.profile_fetch = asyncio.gather(
+            *(self.fetch_user_profile_info(username) for username in self.usernames),
+            return_exceptions=True,
+        )
+        
     async def fetch_user_profile_info(self, username: str) -> None:
         """Fetch user profile information to get tweet count and other stats."""
-        try:
-            self.log_gui(f"Fetching profile info for @{username}...")
+        async with self.profile_sem:
+            # Checked once the slot is held, as a timeline page may have filled these in while waiting
+            status = self.crawl_statuses[username]
+            if status.estimated_total_tweets > 0:
+                return
             
-            async with self.session.get(f"/twitter/user/{username}") as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    if "statuses_count" in data:
-                        status = self.crawl_statuses[username]
-                        status.estimated_total_tweets = data["statuses_count"]
-                        self.log_gui(f"User @{username} has approximately {status.estimated_total_tweets} tweets")
-                        
-                        # Update the status display if this user is selected
-                        if self.selected_username == username:
-                            self.update_status_widget(username)
-                        
-                        # Update the "All" aggregate status
-                        self.update_all_status()
-                else:
-                    error_text = await response.text()
-                    self.log_gui(f"Error fetching profile for @{username}: {response.status} - {error_text}")
-        except Exception as e:
-            self.log_gui(f"Exception fetching profile for @{username}: {e}")
+            # Reuse a recently fetched profile, including ones saved by a previous session
+            cached = self.profile_cache.get(username)
+            if cached and time.time() - cached[0] < PROFILE_CACHE_TTL:
+                self.apply_profile_info(username, cached[1])
+                return
+            
+            # A running crawl gets the count from the author object on its first page,
+            # unless it already has every tweet, and then it looks the profile up itself
+            if status.is_running and not status.is_complete_fetch:
+                return
+            
+            try:
+                self.log_gui(f"Fetching profile info for @{username}...")
+                
+                async with self.session.get(f"/twitter/user/{username}") as response:
+                    if response.status == 200:
+                        data = orjson.loads(await response.read())
+                        self.profile_cache[username] = [time.time(), data]
+                        self.apply_profile_info(username, data)
+                    else:
+                        error_text = await response.text()
+                        self.log_gui(f"Error fetching profile for @{username}: {response.status} - {error_text}")
+            except Exception as e:
+                self.log_gui(f"Exception fetching profile for @{username}: {e}")
             
+    def fetch_profile_without_pages(self, username: str, status: TwitterCrawlStatus) -> None:
+        """Look up the tweet count for a crawl that fetches no timeline page to take it from."""
+        if status.estimated_total_tweets <= 0:
+            task = asyncio.create_task(self.fetch_user_profile_info(username))
+            self.running_tasks.add(task)
+            task.add_done_callback(self.running_tasks.discard)
+
+    def apply_profile_info(self, username: str, data: Dict) -> None:
+        """Update a user's status from their profile data."""
+        if "statuses_count" in data:
+            status = self.crawl_statuses[username]
+            status.estimated_total_tweets = data["statuses_count"]
+            self.log_gui(f"User @{username} has approximately {status.estimated_total_tweets} tweets")
+
+    def load_profile_cache(self) -> None:
+        try:
+            with open(PROFILE_CACHE_FILE, "rb") as f:
+                self.profile_cache = orjson.loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log_gui(f"Error loading profile cache: {e}")
+
+    def load_downloaded_urls(self) -> None:
+        try:
+            with open(DOWNLOADED_URLS_FILE, "rb") as f:
+                self.downloaded_urls = {url: Path(path) for url, path in orjson.loads(f.read()).items()}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log_gui(f"Error loading downloaded URLs: {e}")
+        try:
+            with open(DEAD_URLS_FILE, "rb") as f:
+                self.dead_urls = set(orjson.loads(f.read()))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.log_gui(f"Error loading dead URLs: {e}")
+
     def update_all_status(self) -> None:
         """Update the aggregate 'All' status based on individual user stats."""
         all_status = self.crawl_statuses["All"]
         
-        # Reset counters
-        all_status.tweets_found = 0
-        all_status.images_found = 0 
-        all_status.images_downloaded = 0
-        all_status.estimated_total_tweets = 0
-        all_status.pages_fetched = 0
-        
-        # Set status based on if any users are running
-        any_running = any(status.is_running for username, status in self.crawl_statuses.items() if username != "All")
-        all_complete = all(status.is_complete for username, status in self.crawl_statuses.items() if username != "All")
-        
-        if any_running:
+        # The totals themselves are kept up to date by each user's status
+        if all_status.running_count > 0:
             all_status.status = "Running"
             if all_status.started_at is None:
                 all_status.started_at = time.time()
-        elif all_complete and len(self.usernames) > 0:
+        elif all_status.member_count > 0 and all_status.complete_count == all_status.member_count:
             all_status.status = "Completed"
             if all_status.completed_at is None:
                 all_status.completed_at = time.time()
-                
-        # Aggregate stats
-        for username, status in self.crawl_statuses.items():
-            if username != "All":
-                all_status.tweets_found += status.tweets_found
-                all_status.images_found += status.images_found
-                all_status.images_downloaded += status.images_downloaded
-                all_status.estimated_total_tweets += status.estimated_total_tweets
-                all_status.pages_fetched += status.pages_fetched
-                
-        # Update if All is currently displayed
-        if self.selected_username == "All":
-            self.update_status_widget("All")
 
     def load_usernames(self) -> None:
         try:
-            with open("inputs/twitter_usernames.json") as f_twitter_usernames:
-                self.usernames = json.load(f_twitter_usernames)
+            usernames = orjson.loads(Path("inputs/twitter_usernames.json").read_bytes())
+            # Drop repeated names, keeping the first occurrence, so each user gets one list entry and status
+            self.usernames = list(dict.fromkeys(usernames))
+            if len(self.usernames) < len(usernames):
+                self.log_gui(f"Ignoring {len(usernames) - len(self.usernames)} duplicate usernames")
             self.log_gui(f"Loaded {len(self.usernames)} usernames")
         except Exception as e:
             self.log_gui(f"Error loading usernames: {e}")
@@ -342,10 +516,9 @@ class TwitterCrawlerApp(App):
                 # If Current User filter was active, update it to the newly selected user
                 self.set_log_filter(self.selected_username)
                 # Inform the user that the filter has been updated
-                print(f"Log filter updated to newly selected user: {self.selected_username}")
+                logger.debug("Log filter updated to newly selected user: %s", self.selected_username)
                 
-            # Debug print
-            print(f"User selection changed from {previous_username} to {self.selected_username}")
+            logger.debug("User selection changed from %s to %s", previous_username, self.selected_username)
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         button_id = event.button.id
@@ -381,13 +554,13 @@ class TwitterCrawlerApp(App):
             all_btn.variant = "success"
             user_btn.variant = "default"
             self.log_gui("Showing logs for all users")
-            print(f"Log filter set to: None (all users)")
+            logger.debug("Log filter set to: None (all users)")
         else:
             all_btn.variant = "default"
             user_btn.variant = "success"
             # Don't use log_gui here to avoid filtering out this message
-            log_widget.write(f"Showing logs for @{username} only\n")
-            print(f"Log filter set to: {username}")
+            log_widget.write_line(f"Showing logs for @{username} only")
+            logger.debug("Log filter set to: %s", username)
             
     def action_focus_new_user(self) -> None:
         """Focus the add user input field."""
@@ -432,11 +605,9 @@ class TwitterCrawlerApp(App):
             self.log_gui(f"Error saving usernames: {e}")
             return
             
-        # Initialize crawl status
-        self.crawl_statuses[new_username] = TwitterCrawlStatus(new_username)
-        
-        # Start fetching profile info
-        asyncio.create_task(self.fetch_user_profile_info(new_username))
+        # Initialize crawl status and output directory
+        self.crawl_statuses[new_username] = TwitterCrawlStatus(new_username, self.crawl_statuses["All"])
+        (TWITTER_DIR / new_username).mkdir(parents=True, exist_ok=True)
         
         # Add to UI list
         user_list = self.query_one("#user-list", ListView)
@@ -448,6 +619,9 @@ class TwitterCrawlerApp(App):
         # Automatically start crawling the new user
         self.log_gui(f"Automatically starting crawl for newly added user @{new_username}")
         self.run_crawler(new_username)
+        
+        # Fetch profile info in case the crawl is queued behind others
+        asyncio.create_task(self.fetch_user_profile_info(new_username))
 
     def action_run_selected(self) -> None:
         if self.selected_username:
@@ -458,9 +632,12 @@ class TwitterCrawlerApp(App):
             self.run_crawler(username)
 
     def action_stop_all(self) -> None:
-        for task in self.running_tasks:
-            if not task.done():
-                task.cancel()
+        for task in [*self.crawl_tasks, *self.running_tasks]:
+            task.cancel()
+        # Queued downloads whose future is cancelled are skipped by the workers
+        for futures in self.pending_downloads.values():
+            for future in futures:
+                future.cancel()
         self.log_gui("Stopped all running crawls")
         
     def action_retry_downloads(self) -> None:
@@ -471,57 +648,62 @@ class TwitterCrawlerApp(App):
             
             # Create a task to retry downloads
             task = asyncio.create_task(self.manual_retry_downloads(self.selected_username, status))
-            self.running_tasks.append(task)
+            self.running_tasks.add(task)
+            task.add_done_callback(self.running_tasks.discard)
             
     async def manual_retry_downloads(self, username: str, status: TwitterCrawlStatus) -> None:
         """Manually retry failed downloads for a specific user."""
         try:
             # Set up paths
-            intermediates_base = Path("intermediates")
-            twitter_dir = intermediates_base / "twitter"
-            output_dir = twitter_dir / username
+            output_dir = TWITTER_DIR / username
             
-            # Load tweets from data file
-            data_file = output_dir / f"{username}_tweets.json"
+            # Load tweets from data files
             all_tweets = []
             media_stats = {
                 "error_count": 0,
                 "username": username
             }
             
-            if data_file.exists():
-                try:
-                    with open(data_file, "r") as f:
-                        existing_data = json.load(f)
-                        all_tweets = existing_data.get("tweets", [])
-                        self.log_gui(f"Loaded {len(all_tweets)} tweets for retry")
+            existing_data = self.tweet_cache.get(username)
+            try:
+                if existing_data is None:
+                    existing_data = await asyncio.to_thread(load_tweet_store, output_dir, username)
+                if existing_data is not None:
+                    self.tweet_cache[username] = existing_data
+                    all_tweets = existing_data.get("tweets", [])
+                    self.log_gui(f"Loaded {len(all_tweets)} tweets for retry")
+                    
+                    # Make sure we have the URL tracking dictionaries
+                    if not status.tweet_id_to_url_attempts and "tweet_id_to_url_attempts" in existing_data:
+                        status.tweet_id_to_url_attempts = load_tracking(existing_data["tweet_id_to_url_attempts"])
                         
-                        # Make sure we have the URL tracking dictionaries
-                        if not status.tweet_id_to_url_attempts and "tweet_id_to_url_attempts" in existing_data:
-                            status.tweet_id_to_url_attempts = existing_data["tweet_id_to_url_attempts"]
-                            
-                        if not status.tweet_id_to_url_success and "tweet_id_to_url_success" in existing_data:
-                            status.tweet_id_to_url_success = existing_data["tweet_id_to_url_success"]
-                except Exception as e:
-                    self.log_gui(f"Error loading tweets for retry: {e}")
-                    return
-            else:
+                    if not status.tweet_id_to_url_success and "tweet_id_to_url_success" in existing_data:
+                        status.tweet_id_to_url_success = load_tracking(existing_data["tweet_id_to_url_success"])
+            except Exception as e:
+                self.log_gui(f"Error loading tweets for retry: {e}")
+                return
+            if existing_data is None:
                 self.log_gui(f"No data file found for @{username}")
                 return
                 
             # Retry downloads
+            self.scan_media_files(username, output_dir)
             await self.retry_failed_downloads(username, output_dir, status, media_stats, all_tweets)
+            # Saving before the retried downloads finish would record them as still failed
+            await self.wait_for_downloads(username)
             
-            # Update data file with new attempt counts
-            existing_data["tweet_id_to_url_attempts"] = status.tweet_id_to_url_attempts
-            existing_data["tweet_id_to_url_success"] = status.tweet_id_to_url_success
+            # Update data file with new attempt counts, in a new dict so the cached one is not changed in place
+            retry_data = {
+                **existing_data,
+                "tweet_id_to_url_attempts": dump_tracking(status.tweet_id_to_url_attempts),
+                "tweet_id_to_url_success": dump_tracking(status.tweet_id_to_url_success),
+            }
             
             # Write back to file
-            atomic_write_json(existing_data, data_file, self.log_gui)
+            await asyncio.to_thread(write_tweet_snapshot, retry_data, output_dir, username, self.log_gui)
+            self.tweet_cache[username] = retry_data
             
             self.log_gui(f"Completed manual retry for @{username}")
-            # Update the "All" status
-            self.update_all_status()
             
         except Exception as e:
             self.log_gui(f"Error during manual retry: {e}")
@@ -532,6 +714,15 @@ class TwitterCrawlerApp(App):
         """Clean up resources when app is closing."""
         self.log_gui("Shutting down sessions...")
         
+        for worker in self.image_workers:
+            worker.cancel()
+        if self.profile_fetch is not None:
+            self.profile_fetch.cancel()
+        
+        atomic_write_json(self.profile_cache, PROFILE_CACHE_FILE, self.log_gui)
+        atomic_write_json({url: str(path) for url, path in self.downloaded_urls.items()}, DOWNLOADED_URLS_FILE, self.log_gui)
+        atomic_write_json(sorted(self.dead_urls), DEAD_URLS_FILE, self.log_gui)
+        
         # Close both sessions
         if self.session:
             await self.session.close()
@@ -548,80 +739,119 @@ class TwitterCrawlerApp(App):
             return
             
         status = self.crawl_statuses[username]
-        if status.is_running:
+        if status.is_running or status.is_queued:
             self.log_gui(f"Already crawling @{username}")
             return
 
-        status.start()
-        self.update_status_widget(username)
-        self.update_all_status()  # Update the All view
+        # Only marked running once a crawl slot is free, so waiting users don't show a ticking duration
+        status.queue()
 
         self.log_gui(f"Starting crawl for @{username}")
         task = asyncio.create_task(self.crawl_user(username, status))
-        self.running_tasks.append(task)
+        # Kept apart from the download tasks so a crawl never waits on another crawl
+        self.crawl_tasks.add(task)
+        task.add_done_callback(self.crawl_tasks.discard)
 
-    def update_status_widget(self, username: str) -> None:
-        status_display = self.query_one("#status-display", Static)
-        if self.selected_username == username:
-            status = self.crawl_statuses[username]
-            status_display.update(f"@{status.username}\n{status}")
-            
-        # Update the "All" status whenever any user's status changes
-        if username != "All":
-            self.update_all_status()
+    def refresh_display(self) -> None:
+        """Redraw the selected user's status and write out buffered log lines."""
+        # Counters only change the totals; whether All is running or complete is settled here
+        self.update_all_status()
+        if self.selected_username in self.crawl_statuses:
+            status = self.crawl_statuses[self.selected_username]
+            self.query_one("#status-display", Static).update(f"@{status.username}\n{status}")
+        
+        if self.log_buffer:
+            lines = [self.log_buffer.popleft() for _ in range(len(self.log_buffer))]
+            try:
+                self.query_one("#status-log-content", Log).write_lines(lines)
+            except Exception as e:
+                logger.error("Error writing to log: %s", e)
+                logger.error("\n".join(lines))
 
     def log_gui(self, message: str) -> None:
-        try:
-            log_widget = self.query_one("#status-log-content", Log)
-            log_widget.write(message + "\n")
-        except Exception as e:
-            print(f"Error writing to log: {e}")
-            print(message)
+        self.log_buffer.append(message)
 
     async def crawl_user(self, username: str, status: TwitterCrawlStatus) -> None:
         try:
-            # Create intermediates base directory and user directory
-            intermediates_base = Path("intermediates")
-            intermediates_base.mkdir(exist_ok=True)
-            
-            twitter_dir = intermediates_base / "twitter"
-            twitter_dir.mkdir(exist_ok=True)
-            
-            output_dir = twitter_dir / username
-            output_dir.mkdir(exist_ok=True)
+            async with self.crawl_sem:
+                status.start()
+                await self._crawl_user(username, status)
+        except asyncio.CancelledError:
+            # Stopped before a crawl slot came free, so it can be started again
+            if status.is_queued:
+                status.status = "Waiting"
+            raise
+
+    async def _crawl_user(self, username: str, status: TwitterCrawlStatus) -> None:
+        try:
+            # The user directory was created when the user was loaded or added
+            output_dir = TWITTER_DIR / username
+            self.scan_media_files(username, output_dir)
             
-            # Check for existing data file
-            data_file = output_dir / f"{username}_tweets.json"
+            # Check for existing data files
+            data_file, journal_file, meta_file, tracking_file = tweet_store_paths(output_dir, username)
             all_tweets = []
             
-            # Try to load existing data if available
-            if data_file.exists():
+            # A finished crawl with no downloads left to retry only needs its saved state, not the tweets.
+            # The small tracking file is checked first, so the snapshot is only streamed when that can pay off
+            existing_data = self.tweet_cache.get(username)
+            if existing_data is None and not meta_file.exists() and not journal_file.exists():
                 try:
-                    self.log_gui(f"Found existing data for @{username}, loading...")
-                    with open(data_file, "r") as f:
-                        existing_data = json.load(f)
-                        all_tweets = existing_data.get("tweets", [])
-                        status.tweets_found = len(all_tweets)
-                        status.oldest_id = existing_data.get("oldest_id")
-                        status.is_complete_fetch = existing_data.get("is_complete", False)
-                        self.log_gui(f"Loaded {len(all_tweets)} existing tweets for @{username}")
-                        
-                        # Load image download tracking data if available
-                        if "tweet_id_to_url_attempts" in existing_data:
-                            status.tweet_id_to_url_attempts = existing_data["tweet_id_to_url_attempts"]
-                            self.log_gui(f"Loaded existing attempt data for {len(status.tweet_id_to_url_attempts)} tweets")
-                        
-                        if "tweet_id_to_url_success" in existing_data:
-                            status.tweet_id_to_url_success = existing_data["tweet_id_to_url_success"]
-                            self.log_gui(f"Loaded existing success data for {len(status.tweet_id_to_url_success)} tweets")
-                        
-                        # If we already have all tweets, we can skip fetching
-                        if status.is_complete_fetch:
-                            self.log_gui(f"Already have all tweets for @{username}, skipping fetch")
-                            
+                    tracking = await asyncio.to_thread(read_tracking, tracking_file)
+                    attempts = load_tracking(tracking.get("tweet_id_to_url_attempts", {}))
+                    success = load_tracking(tracking.get("tweet_id_to_url_success", {}))
+                    state = None
+                    # Snapshots from before the tracking file carry their tracking inline, so take the full load
+                    if tracking and all(
+                        success.get(key, False) or count >= 3 or key[1] in self.dead_urls
+                        for key, count in attempts.items()
+                    ):
+                        state = await asyncio.to_thread(load_crawl_state, output_dir, username)
                 except Exception as e:
-                    self.log_gui(f"Error loading existing data for @{username}: {e}")
-                    self.log_gui("Will start fresh fetch")
+                    self.log_gui(f"Error reading crawl state for @{username}: {e}")
+                    state = None
+                if state is not None and state.get("is_complete", False):
+                    status.tweet_id_to_url_attempts = attempts
+                    status.tweet_id_to_url_success = success
+                    status.images_found = len(attempts.keys() | success.keys())
+                    status.images_downloaded = sum(success.values())
+                    status.tweets_found = state["tweet_count"]
+                    status.oldest_id = state.get("oldest_id")
+                    status.is_complete_fetch = True
+                    self.fetch_profile_without_pages(username, status)
+                    status.complete()
+                    self.log_gui(f"Already have all {status.tweets_found} tweets and images for @{username}, nothing to do")
+                    return
+            
+            # Try to load existing data if available, including pages saved since the last snapshot
+            try:
+                if existing_data is None:
+                    existing_data = await asyncio.to_thread(load_tweet_store, output_dir, username)
+                if existing_data is not None:
+                    self.tweet_cache[username] = existing_data
+                    all_tweets = existing_data.get("tweets", [])
+                    status.tweets_found = len(all_tweets)
+                    status.oldest_id = existing_data.get("oldest_id")
+                    status.is_complete_fetch = existing_data.get("is_complete", False)
+                    self.log_gui(f"Loaded {len(all_tweets)} existing tweets for @{username}")
+                    
+                    # Load image download tracking data if available
+                    if "tweet_id_to_url_attempts" in existing_data:
+                        status.tweet_id_to_url_attempts = load_tracking(existing_data["tweet_id_to_url_attempts"])
+                        self.log_gui(f"Loaded existing attempt data for {len(status.tweet_id_to_url_attempts)} URLs")
+                    
+                    if "tweet_id_to_url_success" in existing_data:
+                        status.tweet_id_to_url_success = load_tracking(existing_data["tweet_id_to_url_success"])
+                        self.log_gui(f"Loaded existing success data for {len(status.tweet_id_to_url_success)} URLs")
+                    
+                    # If we already have all tweets, we can skip fetching
+                    if status.is_complete_fetch:
+                        self.log_gui(f"Already have all tweets for @{username}, skipping fetch")
+                        self.fetch_profile_without_pages(username, status)
+                        
+            except Exception as e:
+                self.log_gui(f"Error loading existing data for @{username}: {e}")
+                self.log_gui("Will start fresh fetch")
             
             # Initialize media statistics
             media_stats = {
@@ -634,30 +864,12 @@ class TwitterCrawlerApp(App):
             }
             
             # Check which tweets have already been processed for images
-            processed_tweet_ids = set()
-            if data_file.exists():
-                try:
-                    with open(data_file, "r") as f:
-                        existing_data = json.load(f)
-                        # Extract IDs of tweets that have been processed for images
-                        for tweet in existing_data.get("tweets", []):
-                            if tweet.get("images_processed", False):
-                                processed_tweet_ids.add(tweet.get("id_str") or tweet.get("id", ""))
-                                media_stats["processed_tweets"] += 1
-                except Exception as e:
-                    self.log_gui(f"Error loading processed tweet IDs: {e}")
-            
-            # Track which tweets in the all_tweets list have been processed for images
-            for tweet in all_tweets:
-                tweet_id = tweet.get("id_str") or tweet.get("id", "")
-                if tweet_id in processed_tweet_ids:
-                    tweet["images_processed"] = True
-                else:
-                    tweet["images_processed"] = False
+            # The loaded tweets carry the flag saved with them, from the snapshot or the journal
+            media_stats["processed_tweets"] = sum(1 for t in all_tweets if t.get("images_processed", False))
             
             # Process tweets that have already been fetched but not processed for images
-            if all_tweets and any(not t.get("images_processed", False) for t in all_tweets):
-                await self.process_tweets_for_media(username, all_tweets, output_dir, status, media_stats, data_file, processed_tweet_ids)
+            if media_stats["processed_tweets"] < len(all_tweets):
+                await self.process_tweets_for_media(username, all_tweets, output_dir, status, media_stats, data_file)
             
             # Look for failed downloads that need to be retried
             self.log_gui(f"Checking for failed downloads that need to be retried...")
@@ -668,18 +880,28 @@ class TwitterCrawlerApp(App):
                 self.log_gui(f"Starting tweet fetch for @{username}")
                 max_id = status.oldest_id
                 
+                first_page = True
                 while True:
                     status.pages_fetched += 1
-                    self.update_status_widget(username)
                     
                     # Fetch a page of tweets
                     page_tweets, oldest_id, is_complete = await fetch_tweets(
-                        self.session, username, max_id, self.log_gui
+                        self.session, username, max_id, self.log_gui, self.api_rate_limit
                     )
                     
                     if page_tweets:
                         self.log_gui(f"Retrieved {len(page_tweets)} tweets (page {status.pages_fetched})")
                         
+                        # The author object on each tweet carries the profile's tweet count, so cache it
+                        # from the first page rather than spending a profile request on it later
+                        if first_page:
+                            first_page = False
+                            author = page_tweets[0].get("user") or {}
+                            if "statuses_count" in author:
+                                self.profile_cache[username] = [time.time(), author]
+                                if status.estimated_total_tweets <= 0:
+                                    self.apply_profile_info(username, author)
+                        
                         # Mark all new tweets as not processed for images
                         for tweet in page_tweets:
                             tweet["images_processed"] = False
@@ -687,38 +909,38 @@ class TwitterCrawlerApp(App):
                         # Add to our list of all tweets
                         all_tweets.extend(page_tweets)
                         status.tweets_found = len(all_tweets)
-                        self.update_status_widget(username)
                         
                         # Process this page of tweets for images immediately
-                        await self.process_tweets_for_media(username, page_tweets, output_dir, status, media_stats, data_file, processed_tweet_ids)
+                        await self.process_tweets_for_media(username, page_tweets, output_dir, status, media_stats, data_file)
                         
-                        # Update the data file with all tweets so far
-                        interim_data = {
+                        # Save the small crawl state needed to resume from this page
+                        interim_state = {
                             "username": username,
-                            "tweets": all_tweets,
                             "oldest_id": oldest_id,
                             "is_complete": False,
                             "last_updated": time.time(),
                             "pages_fetched": status.pages_fetched,
                             "media_stats": media_stats,
-                            "tweet_id_to_url_attempts": status.tweet_id_to_url_attempts,
-                            "tweet_id_to_url_success": status.tweet_id_to_url_success
+                            "tweet_id_to_url_attempts": dump_tracking(status.tweet_id_to_url_attempts),
+                            "tweet_id_to_url_success": dump_tracking(status.tweet_id_to_url_success)
                         }
-                        
-                        # Write atomically using our helper function
-                        atomic_write_json(
-                            interim_data, 
-                            data_file,
-                            self.log_gui
-                        )
+                        if status.pages_fetched % SNAPSHOT_EVERY_PAGES:
+                            # Append only this page to the journal instead of rewriting all tweets so far
+                            await asyncio.to_thread(append_jsonl, page_tweets, journal_file, self.log_gui)
+                            await asyncio.to_thread(write_crawl_state, interim_state, output_dir, username, self.log_gui)
+                        else:
+                            # Fold the journal into the full snapshot now and then, so the
+                            # snapshot stays reasonably current during long crawls
+                            interim_data = {**interim_state, "tweets": all_tweets}
+                            await asyncio.to_thread(write_tweet_snapshot, interim_data, output_dir, username, self.log_gui)
                         self.log_gui(f"Saved interim data with {len(all_tweets)} tweets")
+                        # Keep the cached copy in step with the saved state, since it shares all_tweets
+                        self.tweet_cache[username] = {**interim_state, "tweets": all_tweets}
                         
                         # Set up for next page
                         if oldest_id and not is_complete:
                             max_id = oldest_id
                             status.oldest_id = oldest_id
-                            # Avoid hitting rate limits
-                            await asyncio.sleep(1)
                         else:
                             # We've reached the end
                             status.is_complete_fetch = True
@@ -737,36 +959,26 @@ class TwitterCrawlerApp(App):
                     "last_updated": time.time(),
                     "pages_fetched": status.pages_fetched,
                     "media_stats": media_stats,
-                    "tweet_id_to_url_attempts": status.tweet_id_to_url_attempts,
-                    "tweet_id_to_url_success": status.tweet_id_to_url_success
+                    "tweet_id_to_url_attempts": dump_tracking(status.tweet_id_to_url_attempts),
+                    "tweet_id_to_url_success": dump_tracking(status.tweet_id_to_url_success)
                 }
                 
-                # Write final data atomically using our helper
-                atomic_write_json(
-                    final_data,
-                    data_file,
-                    self.log_gui
-                )
+                # Write the full snapshot, which replaces the journal and crawl state
+                await asyncio.to_thread(write_tweet_snapshot, final_data, output_dir, username, self.log_gui)
+                self.tweet_cache[username] = final_data
                 self.log_gui(f"Completed tweet fetch for @{username}, found {len(all_tweets)} tweets")
             
-            # Wait for any pending downloads to complete
-            if any(not task.done() for task in self.running_tasks):
-                download_count = sum(1 for t in self.running_tasks if not t.done())
-                self.log_gui(f"Waiting for {download_count} pending downloads to complete...")
-                
-                # Create a task to periodically update the status
-                pending_tasks = [t for t in self.running_tasks if not t.done()]
-                
-                # Wait for all downloads or until timeout (5 minutes)
-                try:
-                    await asyncio.wait_for(asyncio.gather(*pending_tasks), timeout=300)
-                    self.log_gui("All downloads completed")
-                except asyncio.TimeoutError:
-                    self.log_gui("Timed out waiting for some downloads to complete")
-                    # Cancel any remaining downloads
-                    for task in self.running_tasks:
-                        if not task.done():
-                            task.cancel()
+            # Wait for this user's pending downloads to complete
+            await self.wait_for_downloads(username)
+            
+            # The snapshot's tracking was saved before these downloads finished, so save their outcome
+            tracking = {
+                "tweet_id_to_url_attempts": dump_tracking(status.tweet_id_to_url_attempts),
+                "tweet_id_to_url_success": dump_tracking(status.tweet_id_to_url_success),
+            }
+            await asyncio.to_thread(write_tracking, tracking, output_dir, username, self.log_gui)
+            if username in self.tweet_cache:
+                self.tweet_cache[username] = {**self.tweet_cache[username], **tracking}
             
             # Save final media statistics
             stats_file = output_dir / f"{username}_media_stats.json"
@@ -777,7 +989,7 @@ class TwitterCrawlerApp(App):
             media_stats["completed_at"] = time.time()
             
             # Save statistics
-            atomic_write_json(media_stats, stats_file, self.log_gui)
+            await asyncio.to_thread(atomic_write_json, media_stats, stats_file, self.log_gui, pretty=True)
             
             # Simple summary
             self.log_gui(f"Done with @{username}: {media_stats['tweet_count']} tweets, {media_stats['total_tweets_with_media']} with media")
@@ -785,15 +997,42 @@ class TwitterCrawlerApp(App):
             
             status.complete()
             self.log_gui(f"Completed crawl for @{username}")
+        except asyncio.CancelledError:
+            # The cache may hold tweets past the saved state; reload from disk next time
+            self.tweet_cache.pop(username, None)
+            raise
         except Exception as e:
+            self.tweet_cache.pop(username, None)
             status.fail(str(e))
             self.log_gui(f"Failed crawl for @{username}: {e}")
             import traceback
             self.log_gui(traceback.format_exc())
-        finally:
-            self.update_status_widget(username)
             
 
+    async def wait_for_downloads(self, username: str) -> None:
+        """Wait for the downloads queued for a user, giving up on any still pending after 5 minutes."""
+        pending_futures = [f for f in self.pending_downloads.pop(username, []) if not f.done()]
+        if pending_futures:
+            self.log_gui(f"Waiting for {len(pending_futures)} pending downloads to complete...")
+            
+            # Wait for all downloads or until timeout (5 minutes)
+            try:
+                async with asyncio.timeout(300):
+                    await asyncio.gather(*pending_futures, return_exceptions=True)
+                self.log_gui("All downloads completed")
+            except TimeoutError:
+                # Cancel whatever is left so the workers skip those downloads
+                for future in pending_futures:
+                    future.cancel()
+                self.log_gui("Timed out waiting for some downloads to complete")
+
+    def scan_media_files(self, username: str, output_dir: Path) -> set:
+        """Record which files already exist for a user with a single directory scan."""
+        with os.scandir(output_dir) as entries:
+            names = {entry.name for entry in entries}
+        self.media_files[username] = names
+        return names
+
     async def retry_failed_downloads(
         self,
         username: str,
@@ -813,77 +1052,44 @@ class TwitterCrawlerApp(App):
             all_tweets: List of all tweets for this user
         """
         retry_count = 0
+        # Position of each media URL within its tweet, which numbers the saved file; built on first need
+        url_index = None
         
-        # Iterate through all tweets that have been attempted
-        for tweet_id, url_attempts in status.tweet_id_to_url_attempts.items():
-            # For each URL in this tweet
-            for url, attempts in url_attempts.items():
-                # Check if this URL has failed but hasn't exceeded max attempts
-                success = status.tweet_id_to_url_success.get(tweet_id, {}).get(url, False)
-                if not success and attempts < 3:  # Max 3 attempts
-                    # Determine filename from URL
-                    file_ext = "jpg"  # Default
-                    if "." in url:
-                        url_ext = url.split(".")[-1].lower()
-                        if url_ext in ["jpg", "jpeg", "png", "gif", "webp"]:
-                            file_ext = url_ext
-                    
-                    # Find index of this URL in the tweet's media items
-                    j = 0
+        # Iterate through every URL that has been attempted
+        for (tweet_id, url), attempts in status.tweet_id_to_url_attempts.items():
+            # Check if this URL has failed but hasn't exceeded max attempts
+            success = status.tweet_id_to_url_success.get((tweet_id, url), False)
+            if not success and attempts < 3 and url not in self.dead_urls:  # Max 3 attempts
+                # Find index of this URL in the tweet's media items
+                if url_index is None:
+                    url_index = {}
                     for tweet in all_tweets:
-                        if (tweet.get("id_str") == tweet_id or tweet.get("id") == tweet_id):
-                            # Get all media URLs for this tweet
-                            tweet_urls = []
-                            
-                            # Check entities.media
-                            entities = tweet.get("entities", {})
-                            if entities and "media" in entities:
-                                for media_item in entities.get("media", []):
-                                    media_url = (media_item.get("media_url_https") or 
-                                                media_item.get("media_url") or 
-                                                media_item.get("expanded_url"))
-                                    if media_url:
-                                        tweet_urls.append(media_url)
-                            
-                            # Check extended_entities.media
-                            extended_entities = tweet.get("extended_entities", {})
-                            if extended_entities and "media" in extended_entities:
-                                for media_item in extended_entities.get("media", []):
-                                    media_url = (media_item.get("media_url_https") or 
-                                                media_item.get("media_url") or 
-                                                media_item.get("expanded_url"))
-                                    if media_url:
-                                        tweet_urls.append(media_url)
-                            
-                            # Get index of this URL in the tweet's media items
-                            if url in tweet_urls:
-                                j = tweet_urls.index(url)
-                            break
-                    
-                    # Generate image path
-                    image_path = output_dir / f"{tweet_id}_{j}.{file_ext}"
-                    
-                    # Skip if already downloaded
-                    if image_path.exists():
-                        status.tweet_id_to_url_success[tweet_id][url] = True
-                        status.images_downloaded += 1
+                        tweet_key = tweet.get("id_str") or tweet.get("id", "")
+                        for index, media_item in enumerate(tweet_media(tweet)):
+                            url_index.setdefault((tweet_key, media_item["url"]), index)
+                j = url_index.get((tweet_id, url), 0)
+                
+                # Generate image file name; the Path is only built when downloading
+                image_name = media_file_name(tweet_id, j, url)
+                
+                # Skip if already downloaded
+                if media_file_saved(self.media_files[username], image_name):
+                    status.tweet_id_to_url_success[(tweet_id, url)] = True
+                    status.images_downloaded += 1
+                    if self.verbose:
                         self.log_gui(f"Found already downloaded image for {url}, marking as success")
-                        continue
-                    
-                    # Log retry
-                    self.log_gui(f"Retrying download for {url} (attempt {attempts+1})")
-                    
-                    # Increment attempt counter
-                    status.tweet_id_to_url_attempts[tweet_id][url] = attempts + 1
-                    
-                    # Create a background task for downloading
-                    download_task = asyncio.create_task(
-                        self._download_image_task(url, image_path, tweet_id, username, status, media_stats)
-                    )
-                    # Store the task to prevent it from being garbage collected
-                    self.running_tasks.append(download_task)
-                    retry_count += 1
-        
+                    continue
+                
+                # Log retry
+                self.log_gui(f"Retrying download for {url} (attempt {attempts+1})")
+                
+                # Increment attempt counter
+                status.tweet_id_to_url_attempts[(tweet_id, url)] = attempts + 1
+                
+                # Queue the download for the shared image workers
+                self.queue_image_download(url, output_dir / image_name, tweet_id, username, status, media_stats)
+                retry_count += 1
+    
         if retry_count > 0:
             self.log_gui(f"Initiated {retry_count} download retries for @{username}")
         else:
@@ -896,8 +1102,7 @@ class TwitterCrawlerApp(App):
         output_dir: Path, 
         status: TwitterCrawlStatus, 
         media_stats: Dict, 
-        data_file: Path,
-        processed_tweet_ids: set
+        data_file: Path
     ) -> None:
         """
         Process a list of tweets to extract and download media.
@@ -909,131 +1114,116 @@ class TwitterCrawlerApp(App):
             status: Status object to update
             media_stats: Statistics dictionary to update
             data_file: Path to the data file for saving progress
-            processed_tweet_ids: Set of tweet IDs that have already been processed
         """
         self.log_gui(f"Processing {len(tweets)} tweets for @{username} to extract media")
         tweets_with_media = 0
+        existing_files = self.media_files[username]
+        dead_urls = self.dead_urls
+        media_types = media_stats["media_types"]
         
         for i, tweet in enumerate(tweets):
             # Skip already processed tweets
-            tweet_id = tweet.get("id_str") or tweet.get("id", "")
-            if tweet_id in processed_tweet_ids or tweet.get("images_processed", False):
+            if tweet.get("images_processed", False):
                 continue
+            tweet_id = tweet.get("id_str") or tweet.get("id", "")
                 
             tweet_text = tweet.get("full_text") or tweet.get("text", "")
             truncated_text = (tweet_text[:50] + "...") if tweet_text and len(tweet_text) > 50 else tweet_text
             
             # Debug the entire tweet structure for the first tweet in first batch
-            if media_stats["processed_tweets"] == 0 and i == 0:
-                self.log_gui(f"First tweet structure keys: {tweet.keys()}")
+            if self.verbose and media_stats["processed_tweets"] == 0 and i == 0:
+                self.log_gui(f"First tweet structure keys: {list(tweet)}")
             
             # Get media from all possible sources
-            media_items = []
-            
-            # 1. Check entities.media
-            entities = tweet.get("entities", {})
-            if entities and "media" in entities:
-                media_items.extend(entities.get("media", []))
-            
-            # 2. Check extended_entities.media (often contains videos and multiple images)
-            extended_entities = tweet.get("extended_entities", {})
-            if extended_entities and "media" in extended_entities:
-                extended_media = extended_entities.get("media", [])
-                if media_stats["processed_tweets"] == 0 and i == 0 and extended_media:
-                    self.log_gui(f"Found extended_entities media: {len(extended_media)} items")
-                media_items.extend(extended_media)
-            
-            # 3. Check for image URLs in entities.urls
-            urls = entities.get("urls", [])
-            for url_obj in urls:
-                expanded_url = url_obj.get("expanded_url", "")
-                if expanded_url and any(img_ext in expanded_url.lower() for img_ext in ['.jpg', '.jpeg', '.png', '.gif']):
-                    if media_stats["processed_tweets"] == 0 and i == 0:
-                        self.log_gui(f"Found image URL in expanded_url: {expanded_url}")
-                    media_items.append({
-                        "media_url": expanded_url,
-                        "type": "photo"
-                    })
+            media_items = tweet_media(tweet)
             
             if media_items:
                 tweets_with_media += 1
                 media_stats["total_tweets_with_media"] += 1
                 media_stats["total_media_items"] += len(media_items)
                 
-                self.log_gui(f"Found {len(media_items)} media items in tweet {tweet_id}")
-                status.images_found += len(media_items)
-                self.update_status_widget(username)
+                if self.verbose:
+                    self.log_gui(f"Found {len(media_items)} media items in tweet {tweet_id}")
 
-                # Initialize attempt tracking for this tweet if not already present
-                if tweet_id not in status.tweet_id_to_url_attempts:
-                    status.tweet_id_to_url_attempts[tweet_id] = {}
-                if tweet_id not in status.tweet_id_to_url_success:
-                    status.tweet_id_to_url_success[tweet_id] = {}
+                url_attempts = status.tweet_id_to_url_attempts
+                url_success = status.tweet_id_to_url_success
+                # entities.media and extended_entities.media usually repeat the same photos
+                seen_urls = set()
 
                 for j, media_item in enumerate(media_items):
                     # Track media types
-                    media_type = media_item.get("type", "unknown")
-                    media_stats["media_types"][media_type] = media_stats["media_types"].get(media_type, 0) + 1
+                    media_type = media_item["type"]
+                    media_types[media_type] = media_types.get(media_type, 0) + 1
                     
-                    # Try different fields where the URL might be
-                    media_url = (media_item.get("media_url_https") or 
-                                media_item.get("media_url") or 
-                                media_item.get("expanded_url"))
-                    
-                    if media_url:
+                    media_url = media_item["url"]
+                    if media_url and media_url not in seen_urls:
+                        # The first occurrence keeps its index, matching retry_failed_downloads
+                        seen_urls.add(media_url)
                         # Use the tweet ID and a counter to generate unique filenames
-                        file_ext = "jpg"  # Default
-                        if "." in media_url:
-                            url_ext = media_url.split(".")[-1].lower()
-                            if url_ext in ["jpg", "jpeg", "png", "gif", "webp"]:
-                                file_ext = url_ext
-                                
-                        image_path = output_dir / f"{tweet_id}_{j}.{file_ext}"
+                        image_name = media_file_name(tweet_id, j, media_url)
                         
                         # Check if the file already exists
-                        if image_path.exists():
+                        if media_file_saved(existing_files, image_name):
                             # Count already downloaded media
                             status.images_downloaded += 1
-                            status.tweet_id_to_url_success[tweet_id][media_url] = True
-                            self.update_status_widget(username)
+                            url_success[(tweet_id, media_url)] = True
                         else:
                             # Check if we've attempted this URL before
-                            attempts = status.tweet_id_to_url_attempts[tweet_id].get(media_url, 0)
-                            success = status.tweet_id_to_url_success[tweet_id].get(media_url, False)
+                            attempts = url_attempts.get((tweet_id, media_url), 0)
+                            success = url_success.get((tweet_id, media_url), False)
                             
                             # Only attempt download if we haven't succeeded yet and haven't exceeded max attempts
-                            if not success and attempts < 3:  # Max 3 attempts
+                            if not success and attempts < 3 and media_url not in dead_urls:  # Max 3 attempts
                                 # Increment attempt counter
-                                status.tweet_id_to_url_attempts[tweet_id][media_url] = attempts + 1
+                                url_attempts[(tweet_id, media_url)] = attempts + 1
                                 
-                                # Create a background task for downloading
+                                # Queue the download for the shared image workers
                                 # This allows tweet fetching to continue without waiting for downloads
-                                download_task = asyncio.create_task(
-                                    self._download_image_task(media_url, image_path, tweet_id, username, status, media_stats)
-                                )
-                                # Store the task to prevent it from being garbage collected
-                                self.running_tasks.append(download_task)
+                                self.queue_image_download(media_url, output_dir / image_name, tweet_id, username, status, media_stats)
+                status.images_found += len(seen_urls)
             
             # Mark this tweet as having been PROCESSED for images (not necessarily downloaded)
             # We're separating the concept of "processed" from "downloaded successfully"
             # A tweet is "processed" once we've identified its media and initiated downloads
             tweet["images_processed"] = True
-            processed_tweet_ids.add(tweet_id)
             media_stats["processed_tweets"] += 1
             
             # Log progress regularly
-            if i % 10 == 0 or i == len(tweets) - 1:
+            if i % 1000 == 0 or i == len(tweets) - 1:
                 self.log_gui(f"Processed tweet {i+1}/{len(tweets)} for @{username}")
                 
         if tweets_with_media > 0:
             self.log_gui(f"Found media in {tweets_with_media} out of {len(tweets)} tweets")
     
+    def queue_image_download(
+        self, url: str, path: Path, tweet_id: str, username: str, 
+        status: TwitterCrawlStatus, media_stats: Dict
+    ) -> asyncio.Future:
+        """Queue an image download for the shared workers and return a future for its completion."""
+        future = asyncio.get_running_loop().create_future()
+        self.pending_downloads.setdefault(username, []).append(future)
+        self.image_queue.put_nowait((future, (url, path, tweet_id, username, status, media_stats)))
+        return future
+
+    async def image_worker(self) -> None:
+        """Download queued images one at a time until cancelled."""
+        while True:
+            future, job = await self.image_queue.get()
+            try:
+                # Skip downloads whose crawl stopped waiting for them
+                if not future.done():
+                    await self._download_image_task(*job)
+                    if not future.done():
+                        future.set_result(None)
+            finally:
+                self.image_queue.task_done()
+
     async def _download_image_task(
         self, url: str, path: Path, tweet_id: str, username: str, 
         status: TwitterCrawlStatus, media_stats: Dict
     ) -> None:
         """
-        Background task for downloading an image.
+        Download an image for one of the image workers.
         This runs independently of the tweet processing loop.
         
         Args:
@@ -1045,16 +1235,17 @@ class TwitterCrawlerApp(App):
             media_stats: Statistics dictionary to update
         """
         try:
-            await self.download_image(url, path)
+            await self.fetch_image_once(url, path)
             
             # Update status after successful download
+            self.media_files[username].add(path.name)
             status.images_downloaded += 1
             # Mark as successfully downloaded
-            status.tweet_id_to_url_success[tweet_id][url] = True
-            self.update_status_widget(username)
+            status.tweet_id_to_url_success[(tweet_id, url)] = True
             
-            self.log_gui(f"Successfully downloaded {url} for tweet {tweet_id} on attempt " 
-                         f"{status.tweet_id_to_url_attempts[tweet_id].get(url, 0)}")
+            if self.verbose:
+                self.log_gui(f"Successfully downloaded {url} for tweet {tweet_id} on attempt " 
+                             f"{status.tweet_id_to_url_attempts.get((tweet_id, url), 0)}")
             
         except Exception as e:
             # Count error
@@ -1062,18 +1253,55 @@ class TwitterCrawlerApp(App):
                 media_stats["error_count"] = 0
             media_stats["error_count"] += 1
             
+            if isinstance(e, PermanentDownloadError):
+                self.dead_urls.add(url)
+            
             # Log the error
             self.log_gui(f"Failed to download {url} for tweet {tweet_id} (attempt "
-                         f"{status.tweet_id_to_url_attempts[tweet_id].get(url, 0)}): {str(e)}")
+                         f"{status.tweet_id_to_url_attempts.get((tweet_id, url), 0)}): {str(e)}")
             
             # Mark as not successful
-            status.tweet_id_to_url_success[tweet_id][url] = False
-        
-        # Remove this task from running_tasks when done
-        for task in self.running_tasks[:]:
-            if task.done():
-                self.running_tasks.remove(task)
+            status.tweet_id_to_url_success[(tweet_id, url)] = False
     
+    async def fetch_image_once(self, url: str, path: Path) -> None:
+        """
+        Download a URL to path, fetching each URL at most once.
+        
+        If the URL was already saved, in this session or an earlier one, or is being
+        downloaded by another worker, path is linked to (or copied from) that file instead.
+        """
+        if url in self.in_flight:
+            source, error = await asyncio.shield(self.in_flight[url])
+            if error is not None:
+                raise error
+        else:
+            source = self.downloaded_urls.get(url)
+        
+        if source is not None:
+            try:
+                if source != path:
+                    await asyncio.to_thread(link_or_copy, source, path)
+                elif not path.exists():
+                    raise FileNotFoundError(path)
+                return
+            except FileNotFoundError:
+                # Saved by an earlier session and removed since, so fetch it again
+                self.downloaded_urls.pop(url, None)
+        
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[url] = future
+        try:
+            await self.download_image(url, path)
+            self.downloaded_urls[url] = path
+            future.set_result((path, None))
+        except Exception as e:
+            future.set_result((None, e))
+            raise
+        finally:
+            del self.in_flight[url]
+            if not future.done():
+                future.set_result((None, RuntimeError(f"Download of {url} was cancelled")))
+
     async def download_image(self, url: str, path: Path) -> None:
         """
         Download an image or other media file from a URL.
@@ -1088,37 +1316,123 @@ class TwitterCrawlerApp(App):
             headers = {"User-Agent": "Mozilla/5.0"}
             
             # Log the URL we're trying to download
-            self.log_gui(f"Downloading media from: {url}")
+            if self.verbose:
+                self.log_gui(f"Downloading media from: {url}")
             
             # Use the dedicated image session with the full URL
             # The connection limiting is handled by the TCPConnector
-            async with self.image_session.get(url, headers=headers, timeout=30) as response:
-                if response.status == 200:
-                    # Create parent directories if needed
-                    path.parent.mkdir(parents=True, exist_ok=True)
-                    
-                    # Direct write to file - simple is better
-                    content = await response.read()
-                    with open(path, "wb") as f:
-                        f.write(content)
-                    
-                    self.log_gui(f"Successfully saved {len(content)} bytes to {path.name}")
-                else:
-                    raise Exception(f"HTTP error {response.status}")
+            async with self.image_session.get(url, headers=headers) as response:
+                if response.status in PERMANENT_FAILURE_STATUSES:
+                    raise PermanentDownloadError(f"{url} is gone ({response.status} {response.reason})")
+                response.raise_for_status()
+                
+                # Create parent directories if needed
+                path.parent.mkdir(parents=True, exist_ok=True)
+                
+                # Stream to a partial file and rename it into place once complete,
+                # so an interrupted download never looks like a finished image
+                part_path = path.with_name(path.name + ".part")
+                size = 0
+                try:
+                    async with aiofiles.open(part_path, "wb") as f:
+                        async for chunk in response.content.iter_chunked(64 * 1024):
+                            await f.write(chunk)
+                            size += len(chunk)
+                    os.replace(part_path, path)
+                except BaseException:
+                    part_path.unlink(missing_ok=True)
+                    raise
+                
+                if self.verbose:
+                    self.log_gui(f"Successfully saved {size} bytes to {path.name}")
                     
         except Exception as e:
-            # Use traceback for detailed error info
-            import traceback
-            self.log_gui(f"Error downloading {url}:")
-            self.log_gui(traceback.format_exc())
+            # Use traceback for detailed error info; the failure itself is logged by the caller
+            if self.verbose:
+                import traceback
+                self.log_gui(f"Error downloading {url}:")
+                self.log_gui(traceback.format_exc())
             raise  # Re-raise the original exception
 
 
+def iter_media(tweet: Dict):
+    """
+    Yield every media item of a tweet without modifying the tweet.
+    
+    Items come from entities.media, then extended_entities.media (often contains
+    videos and multiple images), then image links in entities.urls. The order
+    matches the index used in downloaded file names.
+    """
+    entities = tweet.get("entities") or {}
+    yield from entities.get("media") or ()
+    yield from (tweet.get("extended_entities") or {}).get("media") or ()
+    for url_obj in entities.get("urls") or ():
+        expanded_url = url_obj.get("expanded_url", "")
+        # Match the path only, so a query string can neither hide nor fake an image suffix
+        if expanded_url and expanded_url.lower().partition("?")[0].endswith(IMAGE_SUFFIXES):
+            yield {"media_url": expanded_url, "type": "photo"}
+
+
+def media_url_of(media_item: Dict) -> Optional[str]:
+    """Return the URL of a media item from whichever field carries it."""
+    return (media_item.get("media_url_https") or
+            media_item.get("media_url") or
+            media_item.get("expanded_url"))
+
+
+def media_file_name(tweet_id: str, index: int, url: str) -> str:
+    """Return the file name for a tweet's media item, keeping the URL's image extension."""
+    _, _, ext = url.partition("?")[0].rpartition(".")
+    ext = ext.lower()
+    return f"{tweet_id}_{index}.{ext if ext in MEDIA_FILE_EXTENSIONS else 'jpg'}"
+
+
+def media_file_saved(existing_files: set, image_name: str) -> bool:
+    """
+    Check whether a media file was already saved.
+    
+    URLs with a query string used to be saved as .jpg whatever their extension,
+    so that older name counts too.
+    """
+    if image_name in existing_files:
+        return True
+    return not image_name.endswith(".jpg") and f"{image_name.rpartition('.')[0]}.jpg" in existing_files
+
+
+def extract_media(tweet: Dict) -> List[Dict]:
+    """
+    Flatten a tweet's media into {"url", "type"} entries, in file name index order.
+    
+    Items without any URL are kept (with url None) so later indexes stay the same.
+    """
+    return [
+        {"url": media_url_of(media_item), "type": media_item.get("type", "unknown")}
+        for media_item in iter_media(tweet)
+    ]
+
+
+def tweet_media(tweet: Dict) -> List[Dict]:
+    """Return the media extracted by fetch_tweets, extracting it now for tweets saved before that."""
+    media = tweet.get("_media")
+    if media is None:
+        media = tweet["_media"] = extract_media(tweet)
+    return media
+
+
+def retry_delay(headers, attempt: int) -> float:
+    """Seconds to wait before retrying a request, from Retry-After or exponential backoff."""
+    retry_after = headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return float(2 ** attempt)
+
+
 async def fetch_tweets(
     session: ClientSession, 
     username: str, 
     max_id: Optional[str] = None,
-    log_callback = None
+    log_callback = None,
+    rate_limit: Optional[ApiRateLimit] = None
 ) -> (List[Dict], Optional[str], bool):
     """
     Fetch tweets from a user and return them as a list of tweet objects.
@@ -1128,6 +1442,7 @@ async def fetch_tweets(
         username: The Twitter username to fetch tweets for
         max_id: The maximum tweet ID to fetch (for pagination)
         log_callback: Optional callback function for logging
+        rate_limit: Optional shared limiter, waited on before each request and updated from each response
     
     Returns:
         tuple: (tweets list, oldest tweet ID, is_complete flag)
@@ -1140,65 +1455,130 @@ async def fetch_tweets(
     
     try:
         log_msg = f"Fetching tweets for {username}" + (f" with max_id: {max_id}" if max_id else "")
-        print(log_msg)
+        logger.debug(log_msg)
         if log_callback:
             log_callback(log_msg)
             
-        async with session.get(f"/twitter/search?query={encoded_query}") as response:
-            if response.status == 200:
-                data = await response.json()
-                tweets = data.get("tweets", [])
+        # Retry rate limiting, server errors and dropped connections with backoff
+        for attempt in range(FETCH_ATTEMPTS):
+            if rate_limit:
+                await rate_limit.wait()
+            try:
+                async with session.get(f"/twitter/search?query={encoded_query}") as response:
+                    if rate_limit:
+                        rate_limit.update(response.headers)
+                    if response.status == 200:
+                        data = orjson.loads(await response.read())
+                        tweets = data.get("tweets", [])
+                
+                        # Extract media once here so later passes over the tweet don't walk its entities again
+                        for tweet in tweets:
+                            tweet["_media"] = extract_media(tweet)
                 
-                log_msg = f"Retrieved {len(tweets)} tweets for {username}"
-                print(log_msg)
-                if log_callback:
-                    log_callback(log_msg)
+                        log_msg = f"Retrieved {len(tweets)} tweets for {username}"
+                        logger.debug(log_msg)
+                        if log_callback:
+                            log_callback(log_msg)
                 
-                # Check if we've reached the end (no more tweets)
-                is_complete = len(tweets) == 0
+                        # Check if we've reached the end (no more tweets)
+                        is_complete = len(tweets) == 0
                 
-                # Get the oldest tweet ID for pagination
-                oldest_id = None
-                if tweets:
-                    # Sort tweets by ID to find the oldest one
-                    tweet_ids = [int(t.get("id_str", 0) or t.get("id", 0)) for t in tweets]
-                    if tweet_ids:
-                        oldest_id = str(min(tweet_ids))
+                        # Get the oldest tweet ID for pagination
+                        oldest_id = None
+                        if tweets:
+                            # Results come newest first, so the last tweet is the oldest; scan only if they don't
+                            first_id = int(tweets[0].get("id_str") or tweets[0].get("id") or 0)
+                            last_id = int(tweets[-1].get("id_str") or tweets[-1].get("id") or 0)
+                            if last_id <= first_id:
+                                oldest_id = str(last_id)
+                            else:
+                                oldest_id = str(min(int(t.get("id_str") or t.get("id") or 0) for t in tweets))
                         
-                    # Log a sample tweet to see the structure (only on first page)
-                    if not max_id:
-                        print(f"Sample tweet keys: {tweets[0].keys()}")
-                        print(f"Sample tweet content: {json.dumps(tweets[0], indent=2)[:500]}...")
-                        if log_callback:
-                            log_callback(f"Sample tweet keys: {tweets[0].keys()}")
+                            # Log a sample tweet to see the structure (only on first page)
+                            if not max_id:
+                                if logger.isEnabledFor(logging.DEBUG):
+                                    logger.debug("Sample tweet keys: %s", tweets[0].keys())
+                                    logger.debug("Sample tweet content: %s...", repr(tweets[0])[:500])
+                                if log_callback:
+                                    log_callback(f"Sample tweet keys: {tweets[0].keys()}")
                 
-                return tweets, oldest_id, is_complete
-            else:
-                error_text = await response.text()
-                error_msg = f"API error for {username}: {response.status} - {error_text}"
-                print(error_msg)
-                if log_callback:
-                    log_callback(error_msg)
-                raise Exception(f"API returned status {response.status}: {error_text}")
+                        return tweets, oldest_id, is_complete
+            
+                    error_text = await response.text()
+                    if response.status not in RETRY_STATUSES or attempt == FETCH_ATTEMPTS - 1:
+                        error_msg = f"API error for {username}: {response.status} - {error_text}"
+                        logger.error(error_msg)
+                        if log_callback:
+                            log_callback(error_msg)
+                        raise Exception(f"API returned status {response.status}: {error_text}")
+                    delay = retry_delay(response.headers, attempt)
+                    reason = f"status {response.status}"
+                    if response.status == 429 and rate_limit:
+                        # Hold back the other crawls too, they share the same quota
+                        rate_limit.pause(delay)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt == FETCH_ATTEMPTS - 1:
+                    raise
+                delay = retry_delay({}, attempt)
+                reason = str(e) or type(e).__name__
+            
+            log_msg = f"Retrying tweets for {username} in {delay:.0f}s after {reason}"
+            logger.warning(log_msg)
+            if log_callback:
+                log_callback(log_msg)
+            await asyncio.sleep(delay)
     except Exception as e:
         error_msg = f"Exception fetching tweets for {username}: {e}"
-        print(error_msg)
+        logger.error(error_msg)
         if log_callback:
             log_callback(error_msg)
         raise Exception(f"Error fetching tweets: {e}")
 
 
-def atomic_write_json(data: Any, target_path: Path, log_callback=None) -> bool:
+def atomic_write_json(
+    data: Any, target_path: Path, log_callback=None, *, fsync: bool = True, pretty: bool = False
+) -> bool:
     """
     Write JSON data atomically to ensure data integrity even with power failures.
     
+    Args:
+        data: The data to write as JSON
+        target_path: The destination file path
+        log_callback: Optional callback for logging
+        fsync: Whether to wait for the data to reach the disk (see atomic_write_bytes)
+        pretty: Indent the JSON for reading by hand; otherwise it is written compactly
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        payload = orjson.dumps(data, option=option)
+    except Exception as e:
+        if log_callback:
+            log_callback(f"Error writing data atomically: {e}")
+        return False
+    return atomic_write_bytes(payload, target_path, log_callback, fsync=fsync)
+
+
+# Fixed temp file names currently being written by this process; any other one on disk is a leftover
+_claimed_temp_paths = set()
+_claimed_temp_lock = threading.Lock()
+
+
+def atomic_write_bytes(payload: bytes, target_path: Path, log_callback=None, *, fsync: bool = True) -> bool:
+    """
+    Write bytes atomically to ensure data integrity even with power failures.
+    
     Uses a temporary file in the same directory as the target file, then renames it
     in a single atomic operation to replace the target file.
     
     Args:
-        data: The data to write as JSON
+        payload: The bytes to write
         target_path: The destination file path
         log_callback: Optional callback for logging
+        fsync: Whether to wait for the data to reach the disk. Without it the file is
+            still replaced atomically, but a power failure may leave the previous version
         
     Returns:
         bool: True if successful, False otherwise
@@ -1206,16 +1586,32 @@ def atomic_write_json(data: Any, target_path: Path, log_callback=None) -> bool:
     target_dir = target_path.parent
     target_dir.mkdir(parents=True, exist_ok=True)
     
+    # Use the same directory as the target to ensure atomic rename works across filesystems.
+    # Each file normally has a single writer, so a fixed temp name is tried first
+    fixed_temp_path = target_path.with_name(target_path.name + ".tmp")
+    with _claimed_temp_lock:
+        claimed = fixed_temp_path not in _claimed_temp_paths
+        if claimed:
+            _claimed_temp_paths.add(fixed_temp_path)
     try:
-        # Use the same directory as the target to ensure atomic rename works across filesystems
-        with tempfile.NamedTemporaryFile(mode='w', dir=target_dir, delete=False, suffix='.tmp') as tf:
-            temp_path = Path(tf.name)
-            json.dump(data, tf, indent=2)
+        if claimed:
+            # Truncates whatever an interrupted earlier write left behind
+            tf = open(fixed_temp_path, "wb")
+        else:
+            # Another write to this file is in progress, use a unique name
+            tf = tempfile.NamedTemporaryFile(mode='wb', dir=target_dir, delete=False, suffix='.tmp')
+        temp_path = Path(tf.name)
+        with tf:
+            tf.write(payload)
             tf.flush()
-            os.fsync(tf.fileno())  # Ensure data is written to disk
+            if fsync:
+                os.fsync(tf.fileno())  # Ensure data is written to disk
             
-        # Atomic rename
-        temp_path.rename(target_path)
+        # Atomic rename, replacing the target on every platform
+        os.replace(temp_path, target_path)
+        # The rename itself is only durable once the directory entry is on disk too
+        if fsync:
+            fsync_dir(target_dir)
         
         if log_callback:
             log_callback(f"Atomically wrote data to {target_path}")
@@ -1230,6 +1626,246 @@ def atomic_write_json(data: Any, target_path: Path, log_callback=None) -> bool:
         except:
             pass
         return False
+    finally:
+        if claimed:
+            with _claimed_temp_lock:
+                _claimed_temp_paths.discard(fixed_temp_path)
+
+
+def fsync_dir(path: Path) -> None:
+    """Flush a directory's entries to disk, where the platform allows opening directories."""
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    except (AttributeError, OSError):  # No O_DIRECTORY on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def link_or_copy(source: Path, target: Path) -> None:
+    """Hard link target to source, copying instead where links aren't supported."""
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def load_tracking(saved) -> Dict[Tuple[str, str], Any]:
+    """
+    Load an attempt or success map keyed by (tweet_id, url).
+    
+    Accepts the saved [tweet_id, url, value] triples as well as the older
+    nested {tweet_id: {url: value}} form.
+    """
+    if isinstance(saved, dict):
+        return {(tweet_id, url): value for tweet_id, urls in saved.items() for url, value in urls.items()}
+    return {(tweet_id, url): value for tweet_id, url, value in saved}
+
+
+def dump_tracking(tracking: Dict[Tuple[str, str], Any]) -> List[list]:
+    """Convert a (tweet_id, url) keyed map into [tweet_id, url, value] triples for saving."""
+    return [[tweet_id, url, value] for (tweet_id, url), value in tracking.items()]
+
+
+def split_tracking(data: Dict) -> Tuple[Dict, Dict]:
+    """Separate the download tracking maps from the rest of a snapshot or crawl state."""
+    rest = {key: value for key, value in data.items() if key not in TRACKING_KEYS}
+    tracking = {short: data[key] for key, short in TRACKING_KEYS.items() if key in data}
+    return rest, tracking
+
+
+def read_tracking(tracking_file: Path) -> Dict:
+    """Read a user's saved download tracking, under its snapshot keys, or {} if none was saved."""
+    try:
+        saved = msgpack.unpackb(tracking_file.read_bytes(), raw=False)
+    except FileNotFoundError:
+        return {}
+    return {key: saved[short] for key, short in TRACKING_KEYS.items() if short in saved}
+
+
+def write_tracking(data: Dict, output_dir: Path, username: str, log_callback=None, *, fsync: bool = True) -> bool:
+    """Atomically write the download tracking maps found under their snapshot keys in a snapshot or state."""
+    tracking_file = tweet_store_paths(output_dir, username)[3]
+    _, tracking = split_tracking(data)
+    return atomic_write_bytes(msgpack.packb(tracking, use_bin_type=True), tracking_file, log_callback, fsync=fsync)
+
+
+def tweet_store_paths(output_dir: Path, username: str) -> Tuple[Path, Path, Path, Path]:
+    """Return the snapshot, page journal, crawl state and download tracking file paths for a user."""
+    return (
+        output_dir / f"{username}_tweets.json",
+        output_dir / f"{username}_tweets.jsonl",
+        output_dir / f"{username}_meta.json",
+        output_dir / f"{username}_tracking.msgpack",
+    )
+
+
+def append_jsonl(records: List[Dict], target_path: Path, log_callback=None) -> bool:
+    """
+    Append records to a JSON lines file, one record per line.
+    
+    The records are written with a single write followed by an fsync, so saving
+    a page costs the same no matter how many tweets were saved before it.
+    
+    Args:
+        records: The records to append
+        target_path: The JSON lines file to append to
+        log_callback: Optional callback for logging
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    try:
+        payload = b"".join(orjson.dumps(record) + b"\n" for record in records)
+        with open(target_path, "a+b") as f:
+            # Start on a fresh line if an interrupted append left the last one unfinished
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    payload = b"\n" + payload
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        return True
+    except Exception as e:
+        if log_callback:
+            log_callback(f"Error appending data to {target_path}: {e}")
+        return False
+
+
+def iter_jsonl(f):
+    """Yield each record of an open JSON lines file, skipping lines left partially written."""
+    for line in f:
+        try:
+            yield orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue
+
+
+def load_crawl_state(output_dir: Path, username: str) -> Optional[Dict]:
+    """
+    Read a user's snapshot without building its tweets, streaming past the tweets array.
+    
+    The download tracking is saved separately, see read_tracking.
+    
+    Returns:
+        dict of the snapshot's other top-level keys and "tweet_count", or None if
+        there is no snapshot
+    """
+    data_file = tweet_store_paths(output_dir, username)[0]
+    try:
+        f = open(data_file, "rb")
+    except FileNotFoundError:
+        return None
+    state = {}
+    tweet_count = 0
+    key = builder = None
+    with f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == "":
+                # A top-level key or the end of the document finishes the value being built
+                if builder is not None:
+                    state[key] = builder.value
+                    builder = None
+                if event == "map_key" and value != "tweets":
+                    key, builder = value, ijson.ObjectBuilder()
+            elif builder is not None:
+                builder.event(event, value)
+            elif prefix == "tweets.item" and event == "start_map":
+                tweet_count += 1
+    state["tweet_count"] = tweet_count
+    return state
+
+
+def read_json_file(path: Path) -> Optional[Any]:
+    """Parse a JSON file in one read, or return None if it doesn't exist."""
+    try:
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
+        return None
+
+
+def load_tweet_store(output_dir: Path, username: str) -> Dict:
+    """
+    Load everything saved for a user's crawl.
+    
+    Starts from the {username}_tweets.json snapshot, then applies the crawl state
+    and the journal of pages appended since that snapshot by an unfinished crawl.
+    
+    Returns:
+        dict in the snapshot format, or None if nothing has been saved yet
+    """
+    data_file, journal_file, meta_file, tracking_file = tweet_store_paths(output_dir, username)
+    data = read_json_file(data_file)
+    state = read_json_file(meta_file)
+    if state is not None:
+        data = {**(data or {}), **state}
+    # Saved with every snapshot and crawl state, so never older than either
+    tracking = read_tracking(tracking_file)
+    if tracking:
+        data = {**(data or {}), **tracking}
+    try:
+        journal = open(journal_file, "rb")
+    except FileNotFoundError:
+        return data
+    with journal:
+        data = data if data is not None else {}
+        tweets = data.setdefault("tweets", [])
+        seen_ids = {t.get("id_str") or t.get("id", "") for t in tweets}
+        for tweet in iter_jsonl(journal):
+            tweet_id = tweet.get("id_str") or tweet.get("id", "")
+            if tweet_id not in seen_ids:
+                seen_ids.add(tweet_id)
+                tweets.append(tweet)
+    return data
+
+
+def write_tweet_snapshot(data: Dict, output_dir: Path, username: str, log_callback=None) -> bool:
+    """
+    Atomically write a user's full snapshot and drop the journal and state it supersedes.
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    data_file, journal_file, meta_file, _ = tweet_store_paths(output_dir, username)
+    if not write_tracking(data, output_dir, username, log_callback):
+        return False
+    data, _ = split_tracking(data)
+    if not atomic_write_json(data, data_file, log_callback):
+        return False
+    journal_file.unlink(missing_ok=True)
+    meta_file.unlink(missing_ok=True)
+    return True
+
+
+def write_crawl_state(state: Dict, output_dir: Path, username: str, log_callback=None) -> bool:
+    """
+    Atomically write the crawl state saved alongside the page journal between snapshots.
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    meta_file = tweet_store_paths(output_dir, username)[2]
+    # Not fsynced: the journal is, so losing the latest state only means refetching a page or two
+    if not write_tracking(state, output_dir, username, log_callback, fsync=False):
+        return False
+    state, _ = split_tracking(state)
+    return atomic_write_json(state, meta_file, log_callback, fsync=False)
+
+
+def create_connector(limit: int, limit_per_host: int) -> aiohttp.TCPConnector:
+    """Build a connection pool that keeps connections alive and caches DNS lookups."""
+    return aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+        resolver=aiohttp.AsyncResolver() if aiodns else None,
+    )
 
 
 def initialize_session() -> ClientSession:
@@ -1240,13 +1876,25 @@ def initialize_session() -> ClientSession:
     return ClientSession(
         base_url="https://api.socialdata.tools/",
         headers={"Authorization": "Bearer " + socialdata_api_key},
+        connector=create_connector(limit=128, limit_per_host=32),
+        timeout=aiohttp.ClientTimeout(total=60, connect=10, sock_read=30),
     )
 
 
 async def main():
+    log_file = os.getenv("CRAWLER_LOG_FILE")
+    if log_file:
+        handler = logging.FileHandler(log_file, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.DEBUG)
+    
     app = TwitterCrawlerApp()
     await app.run_async()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())